@@ -5,21 +5,198 @@ This module contains the optimization algorithms for task assignment
 separate from the MCP server protocol handling.
 """
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, NamedTuple, Tuple, Optional
+import numpy as np
 from ortools.sat.python import cp_model
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# All scores are integers in [0, SCORE_SCALE], so they feed OR-Tools and
+# the argmax directly without float conversion
+SCORE_SCALE = 10000
+
+# Workload tiers by utilization after assignment: ideal (<= 0.7), good
+# (<= 0.85), high but manageable (<= 1.0) and overloaded
+_UTILIZATION_THRESHOLDS = np.array([0.7, 0.85, 1.0])
+_UTILIZATION_SCORES = np.array([10000, 8000, 5000, 2000], dtype=np.int64)
+
+
+def _score_kernel(
+    workload,
+    max_hours,
+    task_hours,
+    avail_scores,
+    match_counts,
+    skill_counts,
+    num_required,
+    skill_weight,
+    workload_weight,
+    availability_weight
+):
+    """
+    Compute composite, skill and workload scores for every member
+
+    Each np.where cascade is applied from the last case to the first, so
+    earlier cases take precedence.
+    """
+    num_members = workload.shape[0]
+
+    # Skill match
+    if num_required == 0:
+        # Neutral score for tasks with no specific requirements
+        skill_scores = np.full(num_members, 7000, dtype=np.int64)
+    else:
+        match_ratio = match_counts * SCORE_SCALE // num_required
+
+        # Bonus for additional relevant skills
+        versatility_bonus = np.minimum(2000, (skill_counts - match_counts) * 500)
+
+        # Experience modifier (percent) based on total skills
+        experience_modifier = np.minimum(120, 100 + skill_counts * 2)
+
+        skill_scores = np.minimum(
+            SCORE_SCALE, (match_ratio + versatility_bonus) * experience_modifier // 100
+        )
+        skill_scores = np.where(match_counts == 0, 2000, skill_scores)  # Some potential for learning
+        skill_scores = np.where(skill_counts == 0, 1000, skill_scores)  # No listed skills
+
+    # Workload impact, scored on remaining capacity after assignment; the
+    # division is only guarded since members without capacity score 0
+    available_capacity = max_hours - workload
+    max_capacity = np.where(max_hours > 0, max_hours, 1.0)
+    utilization_after = (workload + task_hours) / max_capacity
+
+    # Branchless tier lookup instead of an if/elif ladder per member
+    tiers = np.searchsorted(_UTILIZATION_THRESHOLDS, utilization_after)
+    workload_scores = _UTILIZATION_SCORES[tiers]
+    partial_scores = np.rint(
+        3000 * available_capacity / (task_hours if task_hours > 0 else 1.0)
+    ).astype(np.int64)
+    workload_scores = np.where(task_hours > available_capacity, partial_scores, workload_scores)
+    workload_scores = np.where(available_capacity <= 0, 0, workload_scores)  # No capacity
+
+    member_scores = (
+        skill_scores * skill_weight +
+        workload_scores * workload_weight +
+        avail_scores * availability_weight
+    ) // SCORE_SCALE
+
+    return member_scores, skill_scores, workload_scores
+
+
+class MemberScores(NamedTuple):
+    """Score arrays for a roster, computed once and carried through to the rationale"""
+    total: np.ndarray
+    skill: np.ndarray
+    workload: np.ndarray
+    availability: np.ndarray
+
+
+class MemberRecord:
+    """Team member fields, read once from the request dict"""
+
+    __slots__ = ('name', 'email', 'skill_set', 'workload', 'max_hours', 'availability')
+
+    def __init__(self, member: Dict):
+        self.name = member.get('name')
+        self.email = member.get('email')
+        self.skill_set = frozenset(skill.lower() for skill in member.get('skills', []))
+        self.workload = member.get('current_workload', 0)
+        self.max_hours = member.get('max_hours', 40)
+        self.availability = member.get('availability', 'available')
+
+
+class TeamRoster:
+    """
+    Struct-of-arrays view of the team, built once per request so member
+    scores can be computed as vectorized NumPy expressions
+    """
+
+    _AVAIL_SCORES = {
+        'available': 10000,
+        'busy': 3000,
+        'out_of_office': 0,
+        'vacation': 0,
+    }
+
+    def __init__(self, team_members: List[Dict]):
+        self.records = [MemberRecord(member) for member in team_members]
+        skill_sets = [record.skill_set for record in self.records]
+        self.skill_counts = np.array([len(skills) for skills in skill_sets], dtype=np.int64)
+
+        # Skills as bitmasks over the team's skill vocabulary, so matching is
+        # an AND plus popcount instead of a set intersection per member
+        self.skill_vocab = {}
+        for skills in skill_sets:
+            for skill in skills:
+                self.skill_vocab.setdefault(skill, len(self.skill_vocab))
+        self.skill_masks = [self.skill_mask(skills) for skills in skill_sets]
+
+        # Vocabularies of up to 64 skills fit one machine word per member
+        self.skill_mask_array = (
+            np.array(self.skill_masks, dtype=np.uint64) if len(self.skill_vocab) <= 64 else None
+        )
+
+        self.workload = np.array(
+            [record.workload for record in self.records], dtype=np.float64
+        )
+        self.max_hours = np.array(
+            [record.max_hours for record in self.records], dtype=np.float64
+        )
+        avail_score = self._AVAIL_SCORES.get
+        self.avail_score = np.array(
+            [avail_score(record.availability, 5000) for record in self.records],
+            dtype=np.int64
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def skill_mask(self, skills: frozenset) -> int:
+        """Bitmask of the given lowercased skills; skills nobody on the team has are dropped"""
+        mask = 0
+        for skill in skills:
+            index = self.skill_vocab.get(skill)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def match_counts(self, skills: frozenset) -> np.ndarray:
+        """Number of the given lowercased skills each member has"""
+        mask = self.skill_mask(skills)
+
+        if self.skill_mask_array is not None:
+            shared = np.bitwise_and(self.skill_mask_array, np.uint64(mask))
+            bits = np.unpackbits(shared.view(np.uint8)).reshape(-1, 64)
+            return bits.sum(axis=1, dtype=np.int64)
+
+        return np.array(
+            [bin(mask & member_mask).count('1') for member_mask in self.skill_masks],
+            dtype=np.int64
+        )
+
 class TaskSchedulingModel:
     """
     Advanced task scheduling model with multiple constraints and objectives
     """
 
     def __init__(self):
-        self.skill_weight = 0.6
-        self.workload_weight = 0.3
-        self.availability_weight = 0.1
+        # Weights sum to SCORE_SCALE
+        self.skill_weight = 6000
+        self.workload_weight = 3000
+        self.availability_weight = 1000
+
+        # Upper bound on CP-SAT portfolio workers for large models
+        self.max_search_workers = 8
+
+        # Reused across solves; construction and parameter parsing dominate
+        # the cost of these tiny 1-of-N models
+        self._solver = cp_model.CpSolver()
+        self._solver.parameters.max_time_in_seconds = 10.0  # 10 second timeout
+        self._solver.parameters.cp_model_presolve = False
+        self._solver.parameters.linearization_level = 0  # Pure boolean model
 
     def solve_assignment(
         self,
@@ -38,10 +215,44 @@ class TaskSchedulingModel:
         Returns:
             Assignment solution with scores and alternatives
         """
+        roster = TeamRoster(team_members)
+
+        # Calculate scores and hard constraints
+        scores = self._calculate_member_scores(task_requirements, roster)
+        eligible = self._eligible_members(roster, constraints)
+
+        if not eligible:
+            logger.warning("No eligible team members")
+            return self._fallback_solution(roster.records, scores, task_requirements)
+
+        if len(eligible) == 1:
+            # Only one candidate, so there is nothing to optimize
+            assigned_index, solve_time = eligible[0], 0.0
+        elif constraints and constraints.get('use_cp_sat'):
+            # Reserved for multi-task/multi-constraint extensions of the model
+            assigned_index, solve_time = self._solve_with_cp_sat(scores.total, eligible)
+            if assigned_index is None:
+                return self._fallback_solution(roster.records, scores, task_requirements)
+        else:
+            # Picking exactly one member to maximize score is a plain argmax
+            start = time.perf_counter()
+            assigned_index = eligible[int(np.argmax(scores.total[eligible]))]
+            solve_time = time.perf_counter() - start
+
+        return self._extract_solution(
+            assigned_index, roster.records, scores, task_requirements, solve_time
+        )
+
+    def _solve_with_cp_sat(
+        self,
+        member_scores: np.ndarray,
+        eligible: List[int]
+    ) -> Tuple[Optional[int], float]:
+        """Solve the assignment with CP-SAT, returning the assigned index and wall time"""
         model = cp_model.CpModel()
 
         # Decision variables
-        num_members = len(team_members)
+        num_members = len(member_scores)
         assignment_vars = [
             model.NewBoolVar(f'assign_member_{i}')
             for i in range(num_members)
@@ -50,213 +261,151 @@ class TaskSchedulingModel:
         # Constraint: exactly one assignment
         model.Add(sum(assignment_vars) == 1)
 
-        # Calculate scores for objective function
-        member_scores = []
-        for i, member in enumerate(team_members):
-            score = self._calculate_member_score(task_requirements, member)
-            member_scores.append(score)
-
-            # Hard constraints
-            if not self._is_member_eligible(task_requirements, member, constraints):
+        # Hard constraints
+        eligible_set = set(eligible)
+        for i in range(num_members):
+            if i not in eligible_set:
                 model.Add(assignment_vars[i] == 0)
 
         # Objective: maximize assignment score
         objective_terms = []
-        for i, score in enumerate(member_scores):
-            # Convert float score to integer for OR-Tools
-            score_int = int(score * 10000)
-            objective_terms.append(assignment_vars[i] * score_int)
+        for i, score in enumerate(member_scores.tolist()):
+            objective_terms.append(assignment_vars[i] * score)
 
         model.Maximize(sum(objective_terms))
 
         # Solve the model
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10.0  # 10 second timeout
-
-        status = solver.Solve(model)
-
-        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-            return self._extract_solution(
-                solver, assignment_vars, team_members, member_scores, task_requirements
-            )
-        else:
-            logger.warning(f"Solver status: {status}")
-            return self._fallback_solution(team_members, member_scores, task_requirements)
-
-    def _calculate_member_score(self, task: Dict, member: Dict) -> float:
-        """Calculate composite score for a team member"""
-        skill_score = self._skill_match_score(task, member)
-        workload_score = self._workload_score(task, member)
-        availability_score = self._availability_score(member)
-
-        return (
-            skill_score * self.skill_weight +
-            workload_score * self.workload_weight +
-            availability_score * self.availability_weight
+        solver = self._solver
+        # Portfolio search only pays for its startup on nontrivial models
+        solver.parameters.num_search_workers = (
+            self.max_search_workers if num_members > 200 else 1
         )
+        status = solver.Solve(model)
 
-    def _skill_match_score(self, task: Dict, member: Dict) -> float:
-        """Calculate skill matching score (0.0 to 1.0)"""
-        required_skills = set(skill.lower() for skill in task.get('skills_required', []))
-        member_skills = set(skill.lower() for skill in member.get('skills', []))
-
-        if not required_skills:
-            return 0.7  # Neutral score for tasks with no specific requirements
-
-        if not member_skills:
-            return 0.1  # Low score for members with no listed skills
-
-        # Direct skill matches
-        matches = required_skills & member_skills
-        if not matches:
-            return 0.2  # Some potential for learning
-
-        match_ratio = len(matches) / len(required_skills)
-
-        # Bonus for additional relevant skills
-        additional_skills = len(member_skills - required_skills)
-        versatility_bonus = min(0.2, additional_skills * 0.05)
-
-        # Experience modifier based on total skills
-        experience_modifier = min(1.2, 1.0 + len(member_skills) * 0.02)
-
-        return min(1.0, (match_ratio + versatility_bonus) * experience_modifier)
-
-    def _workload_score(self, task: Dict, member: Dict) -> float:
-        """Calculate workload impact score (0.0 to 1.0, higher is better)"""
-        current_workload = member.get('current_workload', 0)
-        max_capacity = member.get('max_hours', 40)
-        task_hours = task.get('estimated_hours', 8)
-
-        available_capacity = max_capacity - current_workload
-
-        if available_capacity <= 0:
-            return 0.0  # No capacity available
-
-        if task_hours > available_capacity:
-            # Can partially handle but will be overloaded
-            return 0.3 * (available_capacity / task_hours)
+        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            logger.warning("Solver status: %s", status)
+            return None, solver.WallTime()
 
-        # Score based on remaining capacity after assignment
-        utilization_after = (current_workload + task_hours) / max_capacity
+        for i, var in enumerate(assignment_vars):
+            if solver.Value(var) == 1:
+                return i, solver.WallTime()
 
-        if utilization_after <= 0.7:
-            return 1.0  # Ideal utilization
-        elif utilization_after <= 0.85:
-            return 0.8  # Good utilization
-        elif utilization_after <= 1.0:
-            return 0.5  # High but manageable
-        else:
-            return 0.2  # Overloaded
+        return None, solver.WallTime()
 
-    def _availability_score(self, member: Dict) -> float:
-        """Calculate availability score"""
-        availability = member.get('availability', 'available')
+    def _calculate_member_scores(
+        self,
+        task: Dict,
+        roster: TeamRoster
+    ) -> MemberScores:
+        """Calculate composite and sub-scores for every team member"""
+        required_skills = frozenset(skill.lower() for skill in task.get('skills_required', []))
+
+        # Count direct skill matches up front and leave the numeric scoring
+        # to the kernel
+        match_counts = roster.match_counts(required_skills)
+
+        member_scores, skill_scores, workload_scores = _score_kernel(
+            roster.workload,
+            roster.max_hours,
+            float(task.get('estimated_hours', 8)),
+            roster.avail_score,
+            match_counts,
+            roster.skill_counts,
+            len(required_skills),
+            self.skill_weight,
+            self.workload_weight,
+            self.availability_weight
+        )
 
-        availability_scores = {
-            'available': 1.0,
-            'busy': 0.3,
-            'out_of_office': 0.0,
-            'vacation': 0.0,
-        }
+        return MemberScores(member_scores, skill_scores, workload_scores, roster.avail_score)
 
-        return availability_scores.get(availability, 0.5)
+    def _eligible_members(self, roster: TeamRoster, constraints: Optional[Dict]) -> List[int]:
+        """Return the indices of members that meet hard constraints"""
+        excluded = constraints.get('excluded_members', []) if constraints else []
+        required_skills = frozenset(
+            skill.lower() for skill in constraints.get('required_skills', [])
+        ) if constraints else frozenset()
+        required_mask = roster.skill_mask(required_skills)
 
-    def _is_member_eligible(self, task: Dict, member: Dict, constraints: Optional[Dict]) -> bool:
-        """Check if member meets hard constraints"""
-        # Basic availability check
-        if member.get('availability') in ['out_of_office', 'vacation']:
-            return False
+        eligible = []
+        for i, (member, member_mask) in enumerate(zip(roster.records, roster.skill_masks)):
+            # Basic availability check
+            if member.availability in ['out_of_office', 'vacation']:
+                continue
 
-        # Custom constraints
-        if constraints:
             # Exclusion list
-            excluded = constraints.get('excluded_members', [])
-            if member.get('name') in excluded or member.get('email') in excluded:
-                return False
+            if member.name in excluded or member.email in excluded:
+                continue
 
             # Required skills (must have at least one)
-            required_skills = constraints.get('required_skills', [])
-            if required_skills:
-                member_skills = set(skill.lower() for skill in member.get('skills', []))
-                required_skills_lower = set(skill.lower() for skill in required_skills)
-                if not (member_skills & required_skills_lower):
-                    return False
+            if required_skills and not (member_mask & required_mask):
+                continue
+
+            eligible.append(i)
 
-        return True
+        return eligible
 
     def _extract_solution(
         self,
-        solver: cp_model.CpSolver,
-        assignment_vars: List,
-        team_members: List[Dict],
-        member_scores: List[float],
-        task: Dict
+        assigned_index: int,
+        members: List[MemberRecord],
+        scores: MemberScores,
+        task: Dict,
+        solve_time: float
     ) -> Dict:
         """Extract and format the solution"""
-        # Find assigned member
-        assigned_index = None
-        for i, var in enumerate(assignment_vars):
-            if solver.Value(var) == 1:
-                assigned_index = i
-                break
-
-        if assigned_index is None:
-            return self._fallback_solution(team_members, member_scores, task)
-
-        assigned_member = team_members[assigned_index]
-        assigned_score = member_scores[assigned_index]
-
-        # Generate alternatives
-        alternatives = []
-        for i, (member, score) in enumerate(zip(team_members, member_scores)):
-            if i != assigned_index and score > 0.3:  # Only viable alternatives
-                alternatives.append({
-                    'member': member,
-                    'score': score,
-                    'rationale': self._generate_rationale(task, member, score)
-                })
+        assigned_member = members[assigned_index]
 
-        # Sort alternatives by score
-        alternatives.sort(key=lambda x: x['score'], reverse=True)
+        # Top 3 viable alternatives; a stable sort keeps ties in team order
+        viable = np.flatnonzero(scores.total > 3000)
+        viable = viable[viable != assigned_index]
+        alternatives = viable[np.argsort(-scores.total[viable], kind='stable')][:3]
 
         return {
             'assignment': {
-                'assignee': assigned_member.get('name'),
-                'confidence': assigned_score,
-                'rationale': self._generate_rationale(task, assigned_member, assigned_score)
+                'assignee': assigned_member.name,
+                'confidence': float(scores.total[assigned_index] / SCORE_SCALE),
+                'rationale': self._generate_rationale(
+                    task, assigned_member, scores, assigned_index
+                )
             },
             'alternatives': [
                 {
-                    'assignee': alt['member'].get('name'),
-                    'confidence': alt['score'],
-                    'rationale': alt['rationale']
+                    'assignee': members[i].name,
+                    'confidence': float(scores.total[i] / SCORE_SCALE),
+                    'rationale': self._generate_rationale(task, members[i], scores, i)
                 }
-                for alt in alternatives[:3]  # Top 3 alternatives
+                for i in alternatives.tolist()
             ],
             'optimization_details': {
                 'solver_status': 'OPTIMAL',
-                'solve_time': solver.WallTime(),
-                'total_candidates': len(team_members),
-                'viable_candidates': sum(1 for s in member_scores if s > 0.3)
+                'solve_time': solve_time,
+                'total_candidates': len(members),
+                'viable_candidates': int(np.count_nonzero(scores.total > 3000))
             }
         }
 
-    def _fallback_solution(self, team_members: List[Dict], member_scores: List[float], task: Dict) -> Dict:
+    def _fallback_solution(
+        self,
+        members: List[MemberRecord],
+        scores: MemberScores,
+        task: Dict
+    ) -> Dict:
         """Provide fallback solution when optimization fails"""
-        if not team_members:
+        if not members:
             return {'error': 'No team members available'}
 
         # Simple fallback: choose member with highest score
-        best_index = max(range(len(member_scores)), key=lambda i: member_scores[i])
-        best_member = team_members[best_index]
-        best_score = member_scores[best_index]
+        best_index = int(np.argmax(scores.total))
+        best_member = members[best_index]
+        best_score = float(scores.total[best_index] / SCORE_SCALE)
+        rationale = self._generate_rationale(task, best_member, scores, best_index)
 
         return {
             'assignment': {
-                'assignee': best_member.get('name'),
+                'assignee': best_member.name,
                 'confidence': max(0.3, best_score),  # Minimum confidence for fallback
-                'rationale': f"Fallback assignment: {self._generate_rationale(task, best_member, best_score)}"
+                'rationale': f"Fallback assignment: {rationale}"
             },
             'alternatives': [],
             'optimization_details': {
@@ -265,35 +414,41 @@ class TaskSchedulingModel:
             }
         }
 
-    def _generate_rationale(self, task: Dict, member: Dict, score: float) -> str:
-        """Generate human-readable rationale"""
-        skill_score = self._skill_match_score(task, member)
-        workload_score = self._workload_score(task, member)
+    def _generate_rationale(
+        self,
+        task: Dict,
+        member: MemberRecord,
+        scores: MemberScores,
+        index: int
+    ) -> str:
+        """Generate human-readable rationale from the member's precomputed scores"""
+        skill_score = scores.skill[index]
+        workload_score = scores.workload[index]
 
         reasons = []
 
         # Skill assessment
-        if skill_score > 0.8:
+        if skill_score > 8000:
             reasons.append("excellent skill match")
-        elif skill_score > 0.6:
+        elif skill_score > 6000:
             reasons.append("good skill match")
-        elif skill_score > 0.4:
+        elif skill_score > 4000:
             reasons.append("adequate skills")
         else:
             reasons.append("can learn required skills")
 
         # Workload assessment
-        if workload_score > 0.8:
+        if workload_score > 8000:
             reasons.append("low current workload")
-        elif workload_score > 0.5:
+        elif workload_score > 5000:
             reasons.append("manageable workload")
-        elif workload_score > 0.3:
+        elif workload_score > 3000:
             reasons.append("busy but can accommodate")
         else:
             reasons.append("high workload")
 
         # Availability
-        availability = member.get('availability', 'available')
+        availability = member.availability
         if availability == 'available':
             reasons.append("currently available")
         elif availability == 'busy':
@@ -10,15 +10,41 @@ Uses Google OR-Tools for optimal task assignment based on:
 """
 
 import json
+import multiprocessing
+import os
+import queue
 import sys
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, asdict
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+import numpy as np
 from ortools.sat.python import cp_model
 import logging
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # Fall back to the standard library
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger('ortools').setLevel(logging.ERROR)
+
+# Scores are integers in [0, SCORE_SCALE] so they feed OR-Tools directly
+SCORE_SCALE = 1000
+
+# Slotted dataclasses (Python 3.10+) skip the per-instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 @dataclass
 class Task:
@@ -28,8 +54,12 @@ class Task:
     estimated_hours: float
     deadline: Optional[str] = None
     priority: str = 'medium'
+    required_skill_set: frozenset = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        self.required_skill_set = frozenset(skill.lower() for skill in (self.skills_required or ()))
+
+@dataclass(**_DATACLASS_SLOTS)
 class TeamMember:
     name: str
     email: str
@@ -37,18 +67,145 @@ class TeamMember:
     current_workload: float
     availability: str
     max_hours: float = 40.0
+    skill_set: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.skill_set = frozenset(skill.lower() for skill in (self.skills or ()))
 
 @dataclass
 class Assignment:
     assignee: str
     confidence: float
     rationale: str
+    priority_weight: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'assignee': self.assignee,
+            'confidence': self.confidence,
+            'rationale': self.rationale
+        }
+        if self.priority_weight is not None:
+            result['priority_weight'] = self.priority_weight
+        return result
 
 @dataclass
 class SchedulerResponse:
     assignment: Assignment
     alternatives: List[Assignment]
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'assignment': self.assignment.to_dict(),
+            'alternatives': [alternative.to_dict() for alternative in self.alternatives]
+        }
+
+@dataclass(frozen=True)
+class TeamArrays:
+    """Struct-of-arrays view of a team, shared across repeated requests"""
+    skill_sets: Tuple[frozenset, ...]
+    workload: np.ndarray
+    max_hours: np.ndarray
+    available: np.ndarray
+
+
+# The caches below are keyed on the whole team. Building and hashing that key is
+# itself O(N), so a hit only skips the scoring arrays: at 1000 members it roughly
+# halves optimize_assignment, but parsing the request and building the
+# TeamMember objects dominate end to end, so large teams see little change.
+def _team_key(team: List[TeamMember]) -> Tuple:
+    """Hashable summary of everything scoring reads from the team"""
+    return tuple(
+        (m.skill_set, m.availability, m.current_workload, m.max_hours)
+        for m in team
+    )
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    """Freeze an array that is shared through a cache"""
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=128)
+def _precompute_team(team_key: Tuple) -> TeamArrays:
+    """Build the arrays for a team; the same team is often sent many times in a row"""
+    return TeamArrays(
+        skill_sets=tuple(member[0] for member in team_key),
+        workload=_readonly(np.array([member[2] for member in team_key], dtype=np.float64)),
+        max_hours=_readonly(np.array([member[3] for member in team_key], dtype=np.float64)),
+        available=_readonly(
+            np.array([member[1] == 'available' for member in team_key], dtype=bool)
+        )
+    )
+
+
+def _skill_match_score(required_skills: frozenset, member_skills: frozenset) -> int:
+    """
+    Calculate how well a member's skills match the task requirements
+    Returns score between 0 and SCORE_SCALE
+    """
+    if not required_skills:
+        return 500  # Neutral score for tasks with no specific skill requirements
+
+    # Calculate intersection
+    matched_skills = required_skills.intersection(member_skills)
+
+    if not matched_skills:
+        return 100  # Low score but not zero (might have transferable skills)
+
+    # Score based on percentage of required skills matched
+    match_ratio = SCORE_SCALE * len(matched_skills) // len(required_skills)
+
+    # Bonus for having additional relevant skills
+    extra_skills = member_skills - required_skills
+    bonus = min(200, len(extra_skills) * 50)
+
+    return min(SCORE_SCALE, match_ratio + bonus)
+
+
+@lru_cache(maxsize=128)
+def _skill_match_scores(team_key: Tuple, required_skills: frozenset) -> np.ndarray:
+    """Skill match scores for every member of a team"""
+    return _readonly(np.array(
+        [_skill_match_score(required_skills, skills)
+         for skills in _precompute_team(team_key).skill_sets],
+        dtype=np.int64
+    ))
+
+
+def _workload_score_array(
+    workload: np.ndarray,
+    max_hours: np.ndarray,
+    available: np.ndarray,
+    task_hours: float
+) -> np.ndarray:
+    """
+    Workload impact scores for each member, between 0 and SCORE_SCALE
+    (higher is better)
+    """
+    available_hours = max_hours - workload
+
+    # Score based on how much capacity they have left; the division is only
+    # guarded since members without capacity score 0 below
+    max_hours = np.where(max_hours > 0, max_hours, 1.0)
+    scores = np.rint(SCORE_SCALE * available_hours / max_hours).astype(np.int64)
+
+    # Can partially handle but will be overloaded
+    scores = np.where(task_hours > available_hours, 200, scores)
+
+    return np.where(available & (available_hours > 0), scores, 0)
+
+
+@lru_cache(maxsize=128)
+def _workload_scores(team_key: Tuple, task_hours: float) -> np.ndarray:
+    """Workload impact scores for every member of a team"""
+    team = _precompute_team(team_key)
+    return _readonly(
+        _workload_score_array(team.workload, team.max_hours, team.available, task_hours)
+    )
+
+
 class TaskScheduler:
     """
     OR-Tools based task scheduler that optimizes assignments
@@ -62,175 +219,186 @@ class TaskScheduler:
             'urgent': 4
         }
 
-    def calculate_skill_match_score(self, task: Task, member: TeamMember) -> float:
+        # Upper bound on CP-SAT portfolio workers for large models
+        self.max_search_workers = 8
+
+        # Reused across solves instead of paying solver construction per request
+        self._solver = cp_model.CpSolver()
+        self._solver.parameters.cp_model_presolve = False
+        self._solver.parameters.linearization_level = 0  # Pure boolean model
+        # CP-SAT otherwise resets SIGINT to the default action after each solve,
+        # so Ctrl-C would kill the server instead of raising KeyboardInterrupt
+        self._solver.parameters.catch_sigint_signal = False
+
+    def calculate_skill_match_score(self, task: Task, member: TeamMember) -> int:
         """
         Calculate how well a team member's skills match the task requirements
-        Returns score between 0.0 and 1.0
+        Returns score between 0 and SCORE_SCALE
         """
-        if not task.skills_required:
-            return 0.5  # Neutral score for tasks with no specific skill requirements
-
-        required_skills = set(skill.lower() for skill in task.skills_required)
-        member_skills = set(skill.lower() for skill in member.skills)
+        return _skill_match_score(task.required_skill_set, member.skill_set)
 
-        # Calculate intersection
-        matched_skills = required_skills.intersection(member_skills)
+    def calculate_workload_score(self, task: Task, member: TeamMember) -> int:
+        """
+        Calculate workload impact score between 0 and SCORE_SCALE (higher is better)
+        """
+        # Scored as a one-row team outside the cache, so one-off members
+        # don't evict whole teams
+        return int(_workload_score_array(
+            np.array([member.current_workload], dtype=np.float64),
+            np.array([member.max_hours], dtype=np.float64),
+            np.array([member.availability == 'available']),
+            task.estimated_hours
+        )[0])
+
+    def optimize_assignment(
+        self,
+        task: Task,
+        team: List[TeamMember],
+        use_cp_sat: bool = False
+    ) -> SchedulerResponse:
+        """
+        Find the optimal assignment for a single task
 
-        if not matched_skills:
-            return 0.1  # Low score but not zero (might have transferable skills)
+        Picking exactly one person to maximize score is a plain argmax, so
+        OR-Tools is only used when explicitly requested via use_cp_sat.
+        """
+        # Per-team preprocessing and sub-scores are memoized across requests
+        team_key = _team_key(team)
+        skill_scores = _skill_match_scores(team_key, task.required_skill_set)
+        workload_scores = _workload_scores(team_key, task.estimated_hours)
+
+        # Combined score (weighted)
+        combined_scores = (
+            skill_scores * 600 +  # Skill match is most important
+            workload_scores * 400  # Workload balance is also important
+        ) // SCORE_SCALE
+
+        # The priority weight scales every member equally, so it cannot change
+        # the argmax; it is only reported alongside the assignment
+        priority_weight = self.priority_weights.get(task.priority, 2)
+
+        scores = [
+            {
+                'index': i,
+                'member': member,
+                'skill_score': int(skill_scores[i]),
+                'workload_score': int(workload_scores[i]),
+                'combined_score': int(combined_scores[i])
+            }
+            for i, member in enumerate(team)
+        ]
 
-        # Score based on percentage of required skills matched
-        match_ratio = len(matched_skills) / len(required_skills)
+        if not scores:
+            assigned_index = None
+        elif len(scores) == 1:
+            assigned_index = 0  # Only one candidate, nothing to optimize
+        elif use_cp_sat:
+            assigned_index = self._solve_with_cp_sat(combined_scores)
+        else:
+            assigned_index = int(np.argmax(combined_scores))
 
-        # Bonus for having additional relevant skills
-        extra_skills = member_skills - required_skills
-        bonus = min(0.2, len(extra_skills) * 0.05)
+        if assigned_index is not None:
+            assigned_member = team[assigned_index]
+            assigned_score = scores[assigned_index]
 
-        return min(1.0, match_ratio + bonus)
+            # Generate rationale
+            rationale = self._generate_rationale(task, assigned_member, assigned_score)
 
-    def calculate_workload_score(self, task: Task, member: TeamMember) -> float:
-        """
-        Calculate workload impact score (higher is better)
-        """
-        if member.availability != 'available':
-            return 0.0
+            # Create primary assignment
+            assignment = Assignment(
+                assignee=assigned_member.name,
+                confidence=assigned_score['combined_score'] / SCORE_SCALE,
+                rationale=rationale,
+                priority_weight=priority_weight
+            )
 
-        available_hours = member.max_hours - member.current_workload
+            # Generate alternatives (top 2 other candidates)
+            alternatives = []
+            other_scores = [s for s in scores if s['index'] != assigned_index]
+            other_scores.sort(key=lambda x: x['combined_score'], reverse=True)
+
+            for alt_score in other_scores[:2]:
+                if alt_score['combined_score'] > 100:  # Only include viable alternatives
+                    alt_rationale = self._generate_rationale(task, alt_score['member'], alt_score)
+                    alternatives.append(Assignment(
+                        assignee=alt_score['member'].name,
+                        confidence=alt_score['combined_score'] / SCORE_SCALE,
+                        rationale=alt_rationale
+                    ))
+
+            return SchedulerResponse(
+                assignment=assignment,
+                alternatives=alternatives
+            )
 
-        if available_hours <= 0:
-            return 0.0
+        # Fallback if no solution found
+        logger.warning("No optimal solution found, using fallback")
+        if not scores:
+            raise ValueError("No team members available")
 
-        if task.estimated_hours > available_hours:
-            return 0.2  # Can partially handle but will be overloaded
+        best_score = scores[int(np.argmax(skill_scores))]
+        rationale = self._generate_rationale(task, best_score['member'], best_score)
 
-        # Score based on how much capacity they have left
-        utilization = member.current_workload / member.max_hours
-        return 1.0 - utilization
+        return SchedulerResponse(
+            assignment=Assignment(
+                assignee=best_score['member'].name,
+                confidence=0.5,
+                rationale=f"Fallback assignment - best available skill match: {rationale}",
+                priority_weight=priority_weight
+            ),
+            alternatives=[]
+        )
 
-    def optimize_assignment(self, task: Task, team: List[TeamMember]) -> SchedulerResponse:
+    def _solve_with_cp_sat(self, scores: np.ndarray) -> Optional[int]:
         """
-        Use OR-Tools to find optimal assignment
+        Use OR-Tools to find the assigned index, or None if no solution is found
         """
         model = cp_model.CpModel()
 
         # Decision variables: assign[i] = 1 if person i is assigned to task
         assign = {}
-        for i, member in enumerate(team):
+        for i in range(len(scores)):
             assign[i] = model.NewBoolVar(f'assign_{i}')
 
         # Constraint: exactly one person must be assigned
-        model.Add(sum(assign[i] for i in range(len(team))) == 1)
-
-        # Calculate scores for each team member
-        scores = []
-        for i, member in enumerate(team):
-            skill_score = self.calculate_skill_match_score(task, member)
-            workload_score = self.calculate_workload_score(task, member)
-
-            # Availability constraint
-            if member.availability != 'available':
-                workload_score = 0.0
-
-            # Combined score (weighted)
-            combined_score = (
-                skill_score * 0.6 +  # Skill match is most important
-                workload_score * 0.4  # Workload balance is also important
-            )
-
-            # Apply priority multiplier
-            priority_multiplier = self.priority_weights.get(task.priority, 2)
-            final_score = combined_score * priority_multiplier
-
-            scores.append({
-                'index': i,
-                'member': member,
-                'skill_score': skill_score,
-                'workload_score': workload_score,
-                'combined_score': combined_score,
-                'final_score': final_score
-            })
+        model.Add(sum(assign[i] for i in range(len(scores))) == 1)
 
         # Objective: maximize the score of the assigned person
         objective_terms = []
-        for i, score_data in enumerate(scores):
-            # Convert to integer for OR-Tools (multiply by 1000 for precision)
-            score_int = int(score_data['final_score'] * 1000)
-            objective_terms.append(assign[i] * score_int)
+        for i, score in enumerate(scores.tolist()):
+            objective_terms.append(assign[i] * score)
 
         model.Maximize(sum(objective_terms))
 
         # Solve
-        solver = cp_model.CpSolver()
+        solver = self._solver
+        # Portfolio search only pays for its startup on nontrivial models
+        solver.parameters.num_search_workers = (
+            self.max_search_workers if len(scores) > 200 else 1
+        )
         status = solver.Solve(model)
 
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            # Find the assigned person
-            assigned_index = None
-            for i in range(len(team)):
+            for i in range(len(scores)):
                 if solver.Value(assign[i]) == 1:
-                    assigned_index = i
-                    break
-
-            if assigned_index is not None:
-                assigned_member = team[assigned_index]
-                assigned_score = scores[assigned_index]
-
-                # Generate rationale
-                rationale = self._generate_rationale(task, assigned_member, assigned_score)
+                    return i
 
-                # Create primary assignment
-                assignment = Assignment(
-                    assignee=assigned_member.name,
-                    confidence=assigned_score['combined_score'],
-                    rationale=rationale
-                )
-
-                # Generate alternatives (top 2 other candidates)
-                alternatives = []
-                other_scores = [s for s in scores if s['index'] != assigned_index]
-                other_scores.sort(key=lambda x: x['combined_score'], reverse=True)
-
-                for alt_score in other_scores[:2]:
-                    if alt_score['combined_score'] > 0.1:  # Only include viable alternatives
-                        alt_rationale = self._generate_rationale(task, alt_score['member'], alt_score)
-                        alternatives.append(Assignment(
-                            assignee=alt_score['member'].name,
-                            confidence=alt_score['combined_score'],
-                            rationale=alt_rationale
-                        ))
-
-                return SchedulerResponse(
-                    assignment=assignment,
-                    alternatives=alternatives
-                )
-
-        # Fallback if no solution found
-        logger.warning("No optimal solution found, using fallback")
-        best_member = max(team, key=lambda m: self.calculate_skill_match_score(task, m))
-
-        return SchedulerResponse(
-            assignment=Assignment(
-                assignee=best_member.name,
-                confidence=0.5,
-                rationale="Fallback assignment - best available skill match"
-            ),
-            alternatives=[]
-        )
+        return None
 
     def _generate_rationale(self, task: Task, member: TeamMember, score_data: Dict) -> str:
         """Generate human-readable rationale for assignment"""
         reasons = []
 
-        if score_data['skill_score'] > 0.8:
+        if score_data['skill_score'] > 800:
             reasons.append("excellent skill match")
-        elif score_data['skill_score'] > 0.6:
+        elif score_data['skill_score'] > 600:
             reasons.append("good skill match")
-        elif score_data['skill_score'] > 0.3:
+        elif score_data['skill_score'] > 300:
             reasons.append("some relevant skills")
 
-        if score_data['workload_score'] > 0.7:
+        if score_data['workload_score'] > 700:
             reasons.append("low current workload")
-        elif score_data['workload_score'] > 0.3:
+        elif score_data['workload_score'] > 300:
             reasons.append("manageable workload")
 
         if member.availability == 'available':
@@ -244,6 +412,36 @@ class MCPServer:
 
     def __init__(self):
         self.scheduler = TaskScheduler()
+        self._warm_up()
+
+    def _warm_up(self):
+        """
+        Run throwaway assignments before accepting input, so the first real
+        request does not pay for OR-Tools and NumPy lazy initialization
+        """
+        task = Task(
+            id='warmup',
+            description='',
+            skills_required=['warmup'],
+            estimated_hours=1.0
+        )
+        team = [
+            TeamMember(
+                name=f'warmup_{i}',
+                email='',
+                skills=['warmup'],
+                current_workload=0.0,
+                availability='available'
+            )
+            for i in range(2)
+        ]
+
+        try:
+            # Two members, so neither call takes the single-candidate shortcut
+            self.scheduler.optimize_assignment(task, team)
+            self.scheduler.optimize_assignment(task, team, use_cp_sat=True)
+        except Exception as e:
+            logger.warning("Warm-up failed: %s", e)
 
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming MCP request"""
@@ -259,7 +457,7 @@ class MCPServer:
                 return self._error_response(f"Unknown method: {method}")
 
         except Exception as e:
-            logger.error(f"Error handling request: {e}")
+            logger.error("Error handling request: %s", e)
             return self._error_response(str(e))
 
     def _list_tools(self) -> Dict[str, Any]:
@@ -316,11 +514,13 @@ class MCPServer:
         try:
             # Parse task
             task_data = args.get('task', {})
+            estimated_hours = task_data.get('estimated_hours')
             task = Task(
                 id=task_data.get('id', ''),
                 description=task_data.get('description', ''),
                 skills_required=task_data.get('skills_required', []),
-                estimated_hours=task_data.get('estimated_hours', 8.0),
+                # A null estimate gets the same default as a missing one
+                estimated_hours=8.0 if estimated_hours is None else estimated_hours,
                 priority=task_data.get('priority', 'medium')
             )
 
@@ -344,13 +544,13 @@ class MCPServer:
                 'content': [
                     {
                         'type': 'text',
-                        'text': json.dumps(asdict(result), indent=2)
+                        'text': json_dumps(result.to_dict()).decode('utf-8')
                     }
                 ]
             }
 
         except Exception as e:
-            logger.error(f"Error in schedule_task: {e}")
+            logger.error("Error in schedule_task: %s", e)
             return self._error_response(str(e))
 
     def _error_response(self, message: str) -> Dict[str, Any]:
@@ -359,37 +559,158 @@ class MCPServer:
             'content': [
                 {
                     'type': 'text',
-                    'text': json.dumps({'error': message})
+                    'text': json_dumps({'error': message}).decode('utf-8')
                 }
             ],
             'isError': True
         }
 
 
-def main():
-    """Main MCP server loop"""
-    server = MCPServer()
+# Server instance owned by each batch worker process
+_worker_server = None
+
+# Batching bursts across worker processes is opt-in. A request costs well under
+# a millisecond in-process (roughly 40 ns per request byte), while a cold pool
+# pays a fresh interpreter, imports and warm-up per worker, so the pool only
+# kicks in for bursts carrying at least this many bytes of queued requests (a
+# 2000-member request is about 185 KB). Unset or 0 serves one request at a time.
+POOL_MIN_BATCH_BYTES = int(os.environ.get('TASK_SCHEDULER_POOL_MIN_BATCH_BYTES') or 0)
+
+
+def _init_worker():
+    """Create the server used by a batch worker process"""
+    global _worker_server
+    logger.setLevel(logging.WARNING)
+    _worker_server = MCPServer()
+    # Requests already run in parallel across workers, so keep CP-SAT single-threaded
+    _worker_server.scheduler.max_search_workers = 1
+
+
+def _process_line(server: MCPServer, line: bytes) -> Dict[str, Any]:
+    """Parse and handle one raw request line"""
+    try:
+        request = json_loads(line)
+    except ValueError:  # JSONDecodeError (orjson or json) or undecodable bytes
+        return server._error_response("Invalid JSON request")
+
+    return server.handle_request(request)
 
+
+def _process_in_worker(line: bytes) -> Dict[str, Any]:
+    """Handle one request line in a batch worker process"""
+    return _process_line(_worker_server, line)
+
+
+def _read_lines(stream, lines: queue.Queue):
+    """Forward raw input lines to the queue, followed by None at EOF"""
+    for line in iter(stream.readline, b''):
+        lines.put(line)
+    lines.put(None)
+
+
+def _serve(server: MCPServer):
+    """Handle requests one at a time as they arrive"""
     try:
-        while True:
-            line = sys.stdin.readline()
-            if not line:
+        # Lines stay as bytes, which the JSON parser accepts without a text-mode decode
+        for line in iter(sys.stdin.buffer.readline, b''):
+            sys.stdout.buffer.write(json_dumps(_process_line(server, line)) + b'\n')
+            sys.stdout.buffer.flush()
+
+    except KeyboardInterrupt:
+        logger.warning("Server stopped by user")
+    except Exception as e:
+        logger.error("Server error: %s", e)
+        sys.exit(1)
+
+
+def _serve_batched(server: MCPServer):
+    """Handle requests in batches, shipping large bursts to a process pool"""
+    executor = None
+
+    # Read stdin in the background so bursts of requests can be batched
+    lines = queue.Queue()
+    reader = threading.Thread(target=_read_lines, args=(sys.stdin.buffer, lines), daemon=True)
+    reader.start()
+
+    status = 0
+    try:
+        eof = False
+        while not eof:
+            line = lines.get()
+            if line is None:
                 break
 
-            try:
-                request = json.loads(line.strip())
-                response = server.handle_request(request)
-                print(json.dumps(response))
-                sys.stdout.flush()
-            except json.JSONDecodeError:
-                error_response = server._error_response("Invalid JSON request")
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+            # Drain everything that has already arrived into one batch
+            batch = [line]
+            while True:
+                try:
+                    line = lines.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    eof = True
+                    break
+                batch.append(line)
+
+            responses = None
+            if len(batch) > 1 and sum(map(len, batch)) >= POOL_MIN_BATCH_BYTES:
+                try:
+                    if executor is None:
+                        # Forking is unsafe once the reader and OR-Tools threads exist
+                        executor = ProcessPoolExecutor(
+                            max_workers=os.cpu_count(),
+                            mp_context=multiprocessing.get_context('spawn'),
+                            initializer=_init_worker
+                        )
+                    # map() yields results in request order
+                    responses = list(executor.map(_process_in_worker, batch))
+                except BrokenProcessPool as e:
+                    # A worker died; drop the pool so the next burst starts a fresh one
+                    logger.warning("Batch worker failed, handling batch in-process: %s", e)
+                    executor.shutdown(wait=False)
+                    executor = None
+                except Exception as e:
+                    logger.warning("Batch dispatch failed, handling batch in-process: %s", e)
+
+            if responses is None:
+                responses = [_process_line(server, line) for line in batch]
+
+            for response in responses:
+                sys.stdout.buffer.write(json_dumps(response) + b'\n')
+            sys.stdout.buffer.flush()
 
     except KeyboardInterrupt:
-        logger.info("Server stopped by user")
+        logger.warning("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
+        status = 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if reader.is_alive():
+        # The reader is blocked in readline() holding the stdin lock, which makes
+        # normal interpreter shutdown abort, so flush and leave without it
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+        logging.shutdown()
+        os._exit(status)
+    sys.exit(status)
+
+
+def main():
+    """Main MCP server loop"""
+    # INFO logging adds per-request noise on stderr
+    logger.setLevel(logging.WARNING)
+    server = MCPServer()
+
+    if POOL_MIN_BATCH_BYTES > 0 and (os.cpu_count() or 1) > 1:
+        _serve_batched(server)
+    else:
+        _serve(server)
 
 
 if __name__ == '__main__':